@@ -3,14 +3,15 @@
 RSA Solver Interface - Enhanced version with multiple attack methods
 """
 
+import concurrent.futures
 import logging
+import threading
 from typing import Optional, Dict, Any
 from pathlib import Path
-from Crypto.Util.number import long_to_bytes
 
-from config import SOLVE_COMMANDS, OUTPUT_DIR
+from config import SOLVE_COMMANDS, SOLVE_ALIASES, OUTPUT_DIR
 from utils import (
-    clear_screen, animated_loading, print_success, print_error,
+    clear_screen, print_success, print_error,
     print_info, print_warning, display_help, save_result
 )
 import solver
@@ -18,6 +19,29 @@ import solver
 logger = logging.getLogger(__name__)
 
 
+def _race_factordb_trial(n: int) -> list:
+    """Run the FactorDB lookup and trial division concurrently.
+
+    The HTTP round-trip overlaps with local CPU factoring; whichever
+    produces factors first wins and the loser is cancelled.
+    """
+    factors = []
+    stop_event = threading.Event()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [
+            pool.submit(solver.factorize_with_factordb, n),
+            pool.submit(solver.trial_division, n, stop_event=stop_event),
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result() or []
+            if len(result) >= 2:
+                factors = result
+                stop_event.set()
+                break
+        stop_event.set()
+    return factors
+
+
 class MoodRSA:
     """Advanced RSA solver with multiple attack methods."""
     
@@ -31,7 +55,6 @@ class MoodRSA:
         
     def run(self) -> None:
         """Main solver loop."""
-        animated_loading("Starting RSA Solver", 1.0)
         clear_screen()
         
         print_info("RSA Solver Mode - Type 'help' for available attacks")
@@ -51,70 +74,84 @@ class MoodRSA:
     
     def _process_command(self, cmd: str) -> None:
         """Process solver commands."""
-        for cmd_type, aliases in SOLVE_COMMANDS.items():
-            if cmd in aliases:
-                method_name = f"_attack_{cmd_type}"
-                if hasattr(self, method_name):
-                    getattr(self, method_name)()
-                else:
-                    print_error(f"Attack method {cmd_type} not implemented yet")
-                return
-        
-        print_error(f"Unknown command: {cmd}. Type 'help' for available attacks.")
+        cmd_type = SOLVE_ALIASES.get(cmd)
+        if cmd_type is None:
+            print_error(f"Unknown command: {cmd}. Type 'help' for available attacks.")
+            return
+
+        method = getattr(self, f"_attack_{cmd_type}", None)
+        if method is not None:
+            method()
+        else:
+            print_error(f"Attack method {cmd_type} not implemented yet")
     
+    # Factorization strategies, tried in order. Each callable takes n and
+    # returns factors in its native shape (single factor, pair, or list);
+    # _apply_factor_result normalizes them into rsa_params. Adding a new
+    # engine (ECM, Williams p+1, ...) is a one-line change here.
+    _FACTOR_STRATEGIES = [
+        ("FactorDB + trial division", _race_factordb_trial),
+        ("Pollard's p-1", solver.pollard_pm1),
+        ("Pollard's rho", solver.pollard_rho_factorization),
+        ("Fermat factorization", solver.fermat_factorization),
+        ("sympy factorint", solver.factor_sympy),
+    ]
+
     def _attack_factor(self) -> None:
         """Factor the modulus n using various methods."""
         n = self.rsa_params['n']
         if not n:
             print_error("Modulus n is not set")
             return
-        
-        print_info("Trying factorization methods...")
-        
-        # Try FactorDB first
-        factors = solver.factorize_with_factordb(n)
-        if len(factors) == 2:
-            self.rsa_params['p'] = factors[0]
-            self.rsa_params['q'] = factors[1]
+
+        for name, strategy in self._FACTOR_STRATEGIES:
+            if self._is_factored():
+                return
+            print_info(f"Trying {name}...")
+            try:
+                result = strategy(n)
+            except Exception as e:
+                print_error(f"{name} failed: {e}")
+                continue
+            if self._apply_factor_result(n, result):
+                return
+
+        if not self._is_factored():
+            print_error("All factorization methods failed")
+
+    def _is_factored(self) -> bool:
+        """Check whether rsa_params already holds a valid factorization."""
+        n, p, q = self.rsa_params['n'], self.rsa_params['p'], self.rsa_params['q']
+        return bool(p and q and p * q == n)
+
+    def _apply_factor_result(self, n: int, result) -> bool:
+        """Fill rsa_params from a strategy result; True when it succeeded."""
+        if not result:
+            return False
+
+        if isinstance(result, int):
+            if 1 < result < n and n % result == 0:
+                self.rsa_params['p'] = result
+                self.rsa_params['q'] = n // result
+                self._calculate_phi_and_d()
+                return True
+            return False
+
+        factors = list(result)
+        if len(factors) == 2 and factors[0] * factors[1] == n:
+            self.rsa_params['p'], self.rsa_params['q'] = factors
             self._calculate_phi_and_d()
-            return
-        elif len(factors) > 2:
+            return True
+        if len(factors) > 2:
             print_info("Multiple factors found, calculating phi...")
             phi = 1
             for factor in factors:
                 phi *= (factor - 1)
             self.rsa_params['phi'] = phi
             self._calculate_d()
-            return
-        
-        # Try trial division
-        print_info("Trying trial division...")
-        factors = solver.trial_division(n)
-        if len(factors) == 2:
-            self.rsa_params['p'] = factors[0]
-            self.rsa_params['q'] = factors[1]
-            self._calculate_phi_and_d()
-            return
-        
-        # Try Pollard's rho
-        print_info("Trying Pollard's rho...")
-        factor = solver.pollard_rho_factorization(n)
-        if factor and factor != n:
-            self.rsa_params['p'] = factor
-            self.rsa_params['q'] = n // factor
-            self._calculate_phi_and_d()
-            return
-        
-        # Try Fermat factorization
-        print_info("Trying Fermat factorization...")
-        result = solver.fermat_factorization(n)
-        if result:
-            self.rsa_params['p'], self.rsa_params['q'] = result
-            self._calculate_phi_and_d()
-            return
-        
-        print_error("All factorization methods failed")
-    
+            return True
+        return False
+
     def _attack_square(self) -> None:
         """Square root attack for special cases."""
         n = self.rsa_params['n']
@@ -190,6 +227,23 @@ class MoodRSA:
         else:
             print_error("Pollard's rho failed")
     
+    def _attack_pm1(self) -> None:
+        """Pollard's p-1 factorization."""
+        n = self.rsa_params['n']
+        if not n:
+            print_error("Modulus n is not set")
+            return
+
+        print_info("Running Pollard's p-1 factorization...")
+        factor = solver.pollard_pm1(n)
+        if factor and factor != n:
+            self.rsa_params['p'] = factor
+            self.rsa_params['q'] = n // factor
+            print_success(f"Factors found: {factor} and {n // factor}")
+            self._calculate_phi_and_d()
+        else:
+            print_error("Pollard's p-1 failed")
+
     def _attack_fermat(self) -> None:
         """Fermat factorization for close primes."""
         n = self.rsa_params['n']
@@ -214,9 +268,10 @@ class MoodRSA:
         print_info("1. Linear equations")
         print_info("2. Quadratic equations")
         print_info("3. Cube root attack (e=3)")
-        
+        print_info("4. Håstad broadcast attack (small e, multiple moduli)")
+
         try:
-            choice = int(input("Choose operation [1-3]: "))
+            choice = int(input("Choose operation [1-4]: "))
             
             if choice == 1:
                 print_info("Linear modular equations not implemented yet")
@@ -229,7 +284,9 @@ class MoodRSA:
                 if not n:
                     n = int(input("n: "))
                 
-                solutions = solver.Modulare_Equation_Order2(a, b, c, n)
+                solutions = solver.Modulare_Equation_Order2(
+                    a, b, c, n, self.rsa_params['p'], self.rsa_params['q']
+                )
                 if solutions:
                     print_success(f"Solutions: {solutions}")
                 else:
@@ -251,6 +308,27 @@ class MoodRSA:
                         print_info(f"Raw bytes: {result}")
                 else:
                     print_error("Cube root attack failed")
+            elif choice == 4:
+                e = self.rsa_params['e'] or 3
+                pairs = []
+                if self.rsa_params['n'] and self.rsa_params['ct']:
+                    pairs.append((self.rsa_params['n'], self.rsa_params['ct']))
+
+                print_info(f"Enter (n, ct) pairs for e={e}; leave n blank to finish")
+                while True:
+                    n_str = input("n: ").strip()
+                    if not n_str:
+                        break
+                    ct_str = input("ct: ").strip()
+                    pairs.append((int(n_str), int(ct_str)))
+
+                result = solver.hastad_broadcast_attack(
+                    [n_i for n_i, _ in pairs], [ct_i for _, ct_i in pairs], e
+                )
+                if result:
+                    print_success(f"Recovered message: {result}")
+                else:
+                    print_error("Håstad broadcast attack failed")
         except ValueError:
             print_error("Invalid input")
     
@@ -273,7 +351,7 @@ class MoodRSA:
             return
         
         output_path = OUTPUT_DIR / "id_rsa"
-        success = solver.generate_ssh_key(
+        success, _pem = solver.generate_ssh_key(
             params['n'], params['e'], params['d'], 
             params['p'], params['q'], str(output_path)
         )
@@ -283,10 +361,8 @@ class MoodRSA:
     
     def _attack_options(self) -> None:
         """Display current RSA parameters."""
-        from utils import format_rsa_options
-        from rich.console import Console
-        
-        console = Console()
+        from utils import format_rsa_options, console
+
         table = format_rsa_options(**self.rsa_params)
         console.print(table)
     
@@ -316,6 +392,12 @@ class MoodRSA:
                     d = pow(e, -1, phi)
                     self.rsa_params['d'] = d
                     print_success(f"Calculated private exponent d = {d}")
+                    if p != q:
+                        # Cache CRT parameters so decrypt_rsa can use two
+                        # half-size exponentiations instead of pow(ct, d, n).
+                        self.rsa_params['dp'] = d % (p - 1)
+                        self.rsa_params['dq'] = d % (q - 1)
+                        self.rsa_params['qinv'] = pow(q, -1, p)
                 except ValueError:
                     print_error("Cannot calculate d - e and φ(n) are not coprime")
     
@@ -339,12 +421,12 @@ class MoodRSA:
     
     def _display_result(self, result: int) -> None:
         """Display decryption result in multiple formats."""
-        animated_loading("Decrypting", 1.0)
-        
+        # No animation here: the decryption has already happened by the
+        # time this is called, so the spinner was pure added latency.
         print_success(f"Decrypted integer: {result}")
         
         try:
-            text_bytes = long_to_bytes(result)
+            text_bytes = solver._int_to_bytes(result)
             text = text_bytes.decode('utf-8', errors='ignore')
             print_success(f"Decrypted text: {text}")
             
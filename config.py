@@ -40,10 +40,16 @@ SOLVE_COMMANDS = {
     'wiener': ['wiener', 'wien'],
     'common_modulus': ['common', 'cm'],
     'pollard_rho': ['pollard', 'rho'],
+    'pm1': ['pm1', 'pminus1'],
     'fermat': ['fermat', 'fm'],
     'help': ['help', '?'],
     'exit': ['exit', 'quit', 'back']
 }
 
+# Flat alias -> command-type lookups so dispatch is a single dict get
+# instead of a scan over every command's alias list.
+MAIN_ALIASES = {alias: cmd for cmd, aliases in MAIN_COMMANDS.items() for alias in aliases}
+SOLVE_ALIASES = {alias: cmd for cmd, aliases in SOLVE_COMMANDS.items() for alias in aliases}
+
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_FILE = PROJECT_ROOT / "solvecrypto.log"
\ No newline at end of file
@@ -13,12 +13,12 @@ import click
 from pathlib import Path
 
 from config import (
-    DEFAULT_RSA_VALUES, MAIN_COMMANDS, OUTPUT_DIR, LOG_FILE
+    DEFAULT_RSA_VALUES, MAIN_COMMANDS, MAIN_ALIASES, OUTPUT_DIR, LOG_FILE
 )
 from utils import (
     setup_logging, display_banner, validate_integer_input,
     format_rsa_options, display_help, print_success, print_error,
-    print_info, clear_screen, animated_loading
+    print_info, clear_screen, load_rsa_key_params
 )
 from MoodRSA import MoodRSA
 
@@ -36,7 +36,6 @@ class SolveCryptoMain:
         try:
             clear_screen()
             display_banner()
-            animated_loading("Initializing SolveCrypto", 1.5)
             clear_screen()
             
             print_info("Welcome to SolveCrypto v2.0! Type 'help' for commands.")
@@ -66,27 +65,31 @@ class SolveCryptoMain:
             return
             
         command = parts[0].lower()
-        
-        for cmd_type, aliases in MAIN_COMMANDS.items():
-            if command in aliases:
-                if cmd_type == 'set' and len(parts) >= 3:
-                    self._set_parameter(parts[1].lower(), parts[2])
-                elif cmd_type == 'start':
-                    self._start_solver()
-                elif cmd_type == 'options':
-                    self._show_options()
-                elif cmd_type == 'help':
-                    display_help(MAIN_COMMANDS, "Main Commands")
-                elif cmd_type == 'exit':
-                    self.running = False
-                return
-        
-        print_error(f"Unknown command: {command}. Type 'help' for available commands.")
+
+        cmd_type = MAIN_ALIASES.get(command)
+        if cmd_type is None:
+            print_error(f"Unknown command: {command}. Type 'help' for available commands.")
+            return
+
+        if cmd_type == 'set' and len(parts) >= 3:
+            self._set_parameter(parts[1].lower(), parts[2])
+        elif cmd_type == 'start':
+            self._start_solver()
+        elif cmd_type == 'options':
+            self._show_options()
+        elif cmd_type == 'help':
+            display_help(MAIN_COMMANDS, "Main Commands")
+        elif cmd_type == 'exit':
+            self.running = False
     
     def _set_parameter(self, key: str, value: str) -> None:
         """Set RSA parameter with validation."""
         valid_params = {'n', 'ct', 'e', 'p', 'q', 'phi', 'd'}
-        
+
+        if key == 'pem':
+            self._load_key_file(value)
+            return
+
         if key not in valid_params:
             print_error(f"Invalid parameter: {key}. Valid: {', '.join(valid_params)}")
             return
@@ -99,6 +102,16 @@ class SolveCryptoMain:
         print_success(f"Set {key} = {validated_value}")
         self.logger.info(f"Parameter set: {key} = {validated_value}")
     
+    def _load_key_file(self, path: str) -> None:
+        """Bulk-populate RSA parameters from a PEM/DER key file."""
+        params = load_rsa_key_params(path)
+        if params is None:
+            return
+
+        self.rsa_params.update(params)
+        print_success(f"Loaded {', '.join(params)} from {path}")
+        self.logger.info(f"Parameters loaded from key file: {path}")
+
     def _start_solver(self) -> None:
         """Start the RSA solver interface."""
         try:
@@ -110,8 +123,8 @@ class SolveCryptoMain:
     
     def _show_options(self) -> None:
         """Display current RSA parameters."""
-        from rich.console import Console
-        console = Console()
+        from utils import console
+
         table = format_rsa_options(**self.rsa_params)
         console.print(table)
 
@@ -1,18 +1,63 @@
 from factordb.factordb import FactorDB
 from Crypto.PublicKey import RSA
-from Crypto.Util.number import long_to_bytes, inverse, GCD
 import gmpy2
-import binascii
+from gmpy2 import mpz, powmod, invert
+import concurrent.futures
+import functools
+import json
 import math
+import os
 import random
+import threading
 from typing import List, Optional, Tuple, Union
+from config import OUTPUT_DIR
 from utils import print_success, print_error, print_info
 import logging
 
+# sympy is only needed for the fallback factorization engine; everything
+# else works without it.
+try:
+    from sympy import factorint as _sympy_factorint
+except ImportError:
+    _sympy_factorint = None
+
 logger = logging.getLogger(__name__)
 
+FACTORDB_CACHE_FILE = OUTPUT_DIR / "factordb_cache.json"
+
+
+def _load_factordb_cache() -> dict:
+    """Load the on-disk FactorDB cache, tolerating a missing/corrupt file."""
+    try:
+        with open(FACTORDB_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_factordb_cache(cache: dict) -> None:
+    """Persist the FactorDB cache; failures are non-fatal."""
+    try:
+        with open(FACTORDB_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError as e:
+        logger.warning(f"Could not write FactorDB cache: {e}")
+
+
+@functools.lru_cache(maxsize=None)
 def factorize_with_factordb(n: int) -> List[int]:
-    """Factorize n using FactorDB API."""
+    """Factorize n using FactorDB API.
+
+    Results are memoized in-process and mirrored to a JSON file under the
+    output directory, so repeat queries (the solver is interactive and the
+    same n gets probed over and over) skip the network round-trip.
+    """
+    cache = _load_factordb_cache()
+    cached = cache.get(str(n))
+    if cached:
+        print_info("FactorDB result loaded from cache")
+        return [int(f) for f in cached]
+
     try:
         f = FactorDB(n)
         f.connect()
@@ -20,6 +65,9 @@ def factorize_with_factordb(n: int) -> List[int]:
         if factors:
             print_success(f"Factors found: {factors}")
             logger.info(f"FactorDB found factors: {factors}")
+            if len(factors) > 1:
+                cache[str(n)] = [str(f) for f in factors]
+                _save_factordb_cache(cache)
         else:
             print_error("No factors found in FactorDB")
         return factors
@@ -29,42 +77,52 @@ def factorize_with_factordb(n: int) -> List[int]:
         return []
 
 def integer_square_root(n: int) -> int:
-    """Calculate integer square root using Newton's method."""
+    """Calculate integer square root via the C-implemented math.isqrt."""
     if n < 0:
         raise ValueError("Cannot compute square root of negative number")
-    if n == 0:
-        return 0
-    
-    x = n
-    y = (x + 1) // 2
-    while y < x:
-        x = y
-        y = (x + n // x) // 2
-    return x
+    return math.isqrt(n)
 
 
-def decrypt_rsa(n: int, ct: int, e: int, p: int = 0, q: int = 0, 
-               d: int = 0, phi: int = 0) -> Optional[int]:
-    """Decrypt RSA ciphertext using available parameters."""
+def decrypt_rsa(n: int, ct: int, e: int, p: int = 0, q: int = 0,
+               d: int = 0, phi: int = 0, dp: int = 0, dq: int = 0,
+               qinv: int = 0) -> Optional[int]:
+    """Decrypt RSA ciphertext using available parameters.
+
+    All arithmetic runs on gmpy2.mpz: powmod uses GMP's sliding-window
+    Montgomery exponentiation, which is several times faster than
+    CPython's pow for RSA-sized operands. When the CRT parameters dp, dq
+    and qinv are available (cached by the solver once p and q are known),
+    decryption runs as two half-size exponentiations -- roughly 4x
+    cheaper than one full pow(ct, d, n).
+    """
     try:
+        n, ct, e = mpz(n), mpz(ct), mpz(e)
+        if p and q and dp and dq and qinv:
+            m1 = powmod(ct, dp, p)
+            m2 = powmod(ct, dq, q)
+            h = qinv * (m1 - m2) % p
+            result = int(m2 + h * q)
+            print_success(f"Decrypted using CRT: {result}")
+            return result
+
         if d != 0:
-            result = pow(ct, d, n)
+            result = int(powmod(ct, d, n))
             print_success(f"Decrypted using d: {result}")
             return result
-        
+
         if phi != 0:
-            d_calc = pow(e, -1, phi)
-            result = pow(ct, d_calc, n)
+            d_calc = invert(e, mpz(phi))
+            result = int(powmod(ct, d_calc, n))
             print_success(f"Decrypted using phi: {result}")
             return result
-        
+
         if p != 0 and q != 0:
             if p == q:
-                phi_calc = p * (p - 1)
+                phi_calc = mpz(p) * (p - 1)
             else:
-                phi_calc = (p - 1) * (q - 1)
-            d_calc = pow(e, -1, phi_calc)
-            result = pow(ct, d_calc, n)
+                phi_calc = mpz(p - 1) * (q - 1)
+            d_calc = invert(e, phi_calc)
+            result = int(powmod(ct, d_calc, n))
             print_success(f"Decrypted using p,q: {result}")
             return result
         
@@ -74,18 +132,55 @@ def decrypt_rsa(n: int, ct: int, e: int, p: int = 0, q: int = 0,
         print_error(f"Decryption failed: {ex}")
         logger.error(f"Decryption error: {ex}")
         return None
+def _tonelli_shanks(a: int, p: int) -> Optional[int]:
+    """Square root of a modulo an odd prime p, or None for a non-residue."""
+    a %= p
+    if a == 0:
+        return 0
+    if powmod(a, (p - 1) // 2, p) != 1:
+        return None
+    if p % 4 == 3:
+        return int(powmod(a, (p + 1) // 4, p))
+
+    s, e = p - 1, 0
+    while s & 1 == 0:
+        s >>= 1
+        e += 1
+    z = 2
+    while powmod(z, (p - 1) // 2, p) == 1:
+        z += 1
+
+    x = powmod(a, (s + 1) // 2, p)
+    b = powmod(a, s, p)
+    g = powmod(z, s, p)
+    r = e
+    while True:
+        t = b
+        m = 0
+        for m in range(r):
+            if t == 1:
+                break
+            t = powmod(t, 2, p)
+        if m == 0:
+            return int(x)
+        gs = powmod(g, 1 << (r - m - 1), p)
+        g = (gs * gs) % p
+        x = (x * gs) % p
+        b = (b * g) % p
+        r = m
+
+
 #Modular equation Order 2 ax^2 + bx + c = 0 mod n
-def Modulare_Equation_Order2(a, b, c, n):
-    # Fonction pour calculer le pgcd étendu
-    def extended_gcd(aa, bb):
-        last_remainder, remainder = abs(aa), abs(bb)
-        x, last_x, y, last_y = 0, 1, 1, 0
-        while remainder:
-            last_remainder, (quotient, remainder) = remainder, divmod(last_remainder, remainder)
-            x, last_x = last_x - quotient * x, x
-            y, last_y = last_y - quotient * y, y
-        return last_remainder, last_x * (-1 if aa < 0 else 1), last_y * (-1 if bb < 0 else 1)
+def Modulare_Equation_Order2(a, b, c, n, p=0, q=0):
+    """Solve ax^2 + bx + c = 0 (mod n).
 
+    Tonelli-Shanks is only valid modulo a prime; the previous version
+    applied it to the raw modulus, returning silently wrong answers for
+    composite n (which is what the solver actually passes -- the RSA
+    modulus). When the factorization p, q is supplied, square roots are
+    taken mod each prime and recombined by CRT; otherwise n is treated
+    as prime, preserving the old behavior for genuinely prime moduli.
+    """
     # Normaliser les coefficients
     a %= n
     b %= n
@@ -94,135 +189,321 @@ def Modulare_Equation_Order2(a, b, c, n):
     # Calculer le discriminant
     delta = (b * b - 4 * a * c) % n
 
-    # Vérifier si le discriminant est un résidu quadratique mod n
-    def is_quadratic_residue(d, n):
-        return pow(d, (n - 1) // 2, n) == 1
+    if p and q and p != q and p * q == n:
+        # Racine carrée mod n = CRT des racines mod p et mod q
+        root_p = _tonelli_shanks(delta, p)
+        root_q = _tonelli_shanks(delta, q)
+        if root_p is None or root_q is None:
+            return []
+        q_inv = invert(q, p)
+        sqrt_deltas = set()
+        for rp in {root_p, p - root_p}:
+            for rq in {root_q, q - root_q}:
+                h = (rp - rq) * q_inv % p
+                sqrt_deltas.add(int((rq + h * q) % n))
+    else:
+        root = _tonelli_shanks(delta, n)
+        if root is None:
+            return []
+        sqrt_deltas = {root, n - root}
 
-    if not is_quadratic_residue(delta, n):
-        return []  # Pas de solution si delta n'est pas un résidu quadratique
+    # Résoudre les équations quadratiques résultantes
+    inv_2a = pow(2 * a, -1, n)
+    return sorted({(-b + sd) * inv_2a % n for sd in sqrt_deltas})
 
-    # Trouver une racine carrée de delta mod n
-    def modular_sqrt(a, p):
-        if pow(a, (p - 1) // 2, p) != 1:
-            return None
-        if p % 4 == 3:
-            return pow(a, (p + 1) // 4, p)
-        s, e = p - 1, 0
-        while s % 2 == 0:
-            s //= 2
-            e += 1
-        n = 2
-        while pow(n, (p - 1) // 2, p) == 1:
-            n += 1
-        x = pow(a, (s + 1) // 2, p)
-        b = pow(a, s, p)
-        g = pow(n, s, p)
-        r = e
-        while True:
-            t = b
-            m = 0
-            for m in range(r):
-                if t == 1:
-                    break
-                t = pow(t, 2, p)
-            if m == 0:
-                return x
-            gs = pow(g, 2 ** (r - m - 1), p)
-            g = (gs * gs) % p
-            x = (x * gs) % p
-            b = (b * g) % p
-            r = m
-
-    sqrt_delta = modular_sqrt(delta, n)
-    if sqrt_delta is None:
-        return []
 
-    # Résoudre les équations quadratiques résultantes
-    x1 = (-b + sqrt_delta) * pow(2 * a, -1, n) % n
-    x2 = (-b - sqrt_delta) * pow(2 * a, -1, n) % n
+def _pollard_brent(n: int, x0: int, c: int) -> int:
+    """One run of Pollard's rho with Brent's cycle detection.
 
-    return sorted({x1, x2})
+    The inner step runs in Montgomery form, replacing the big-int division
+    of `% n` with a multiply, shift and mask. Reduction is lazy: values are
+    only kept below a small multiple of n, which is harmless because every
+    intermediate stays congruent mod n and gcd(R, n) = 1 so Montgomery
+    scaling never hides a factor. The product of (x - y) is accumulated
+    over blocks of steps with a single gcd per block, amortizing one
+    expensive gcd over ~m cheap multiplies. Returns a non-trivial factor,
+    or n if this (x0, c) pair failed and the caller should retry.
+    """
+    n = gmpy2.mpz(n)
+    # R = 2^shift >= 16n so lazily-reduced operands (< 4n) satisfy the
+    # REDC precondition t < R*n.
+    shift = (n.bit_length() + 4 + 63) // 64 * 64
+    mask = (gmpy2.mpz(1) << shift) - 1
+    n_neg_inv = gmpy2.invert(-n, mask + 1)
+    r2 = (gmpy2.mpz(1) << (2 * shift)) % n
 
+    def redc(t):
+        return (t + ((t * n_neg_inv) & mask) * n) >> shift
 
-def pollard_rho_factorization(n: int) -> Optional[int]:
-    """Pollard's rho algorithm for factorization."""
+    def to_mont(a):
+        return redc((a % n) * r2)
+
+    c_m = to_mont(c)
+    m = 1 << max(1, n.bit_length() // 5)
+    y, r, q, g = to_mont(x0), 1, gmpy2.mpz(1), gmpy2.mpz(1)
+    x = ys = y
+
+    while g == 1:
+        x = y
+        for _ in range(r):
+            y = redc(y * y) + c_m
+        k = 0
+        while k < r and g == 1:
+            ys = y
+            for _ in range(min(m, r - k)):
+                y = redc(y * y) + c_m
+                q = redc(q * (x - y))
+            g = gmpy2.gcd(q, n)
+            k += m
+        r *= 2
+
+    if g == n:
+        # The batched product collapsed to 0 mod n; replay the last block
+        # one step at a time to recover the factor.
+        g = gmpy2.mpz(1)
+        while g == 1:
+            ys = redc(ys * ys) + c_m
+            g = gmpy2.gcd(x - ys, n)
+
+    return int(g)
+
+
+def pollard_rho_factorization(n: int, max_retries: int = 20) -> Optional[int]:
+    """Pollard's rho algorithm (Brent variant with batched gcd)."""
     if n % 2 == 0:
         return 2
-    
-    x = random.randint(2, n - 2)
-    y = x
-    c = random.randint(1, n - 1)
-    d = 1
-    
-    while d == 1:
-        x = (x * x + c) % n
-        y = (y * y + c) % n
-        y = (y * y + c) % n
-        d = math.gcd(abs(x - y), n)
-        
-        if d == n:
-            return None
-    
-    return d if d != n else None
+    # Miller-Rabin short-circuit: a prime has no factor to find, and
+    # without this the retry loop would burn all its attempts cycling.
+    if gmpy2.is_prime(n):
+        return None
+
+    for _ in range(max_retries):
+        x0 = random.randint(2, n - 2)
+        c = random.randint(1, n - 1)
+        g = _pollard_brent(n, x0, c)
+        if 1 < g < n:
+            return g
+
+    return None
+
+
+# Quadratic-residue bitmask tables: SQ_M[x] is 1 iff x can be a square
+# residue mod M. Three table lookups reject >95% of candidates before the
+# comparatively expensive big-int is_square test.
+def _square_residue_table(m: int) -> List[int]:
+    table = [0] * m
+    for i in range(m):
+        table[(i * i) % m] = 1
+    return table
+
+
+_SQ64 = _square_residue_table(64)
+_SQ63 = _square_residue_table(63)
+_SQ65 = _square_residue_table(65)
+_SQ11 = _square_residue_table(11)
+
 
+def _could_be_square(r: int) -> bool:
+    """Cheap pre-filter: False means r is definitely not a perfect square."""
+    return bool(_SQ64[r & 63] and _SQ63[r % 63] and _SQ65[r % 65] and _SQ11[r % 11])
 
-def fermat_factorization(n: int) -> Optional[Tuple[int, int]]:
-    """Fermat's factorization method."""
+
+def _fermat_range(n: int, k_start: int, k_stop: int) -> Optional[Tuple[int, int]]:
+    """Scan Hart multipliers k in [k_start, k_stop) for a factor of n."""
+    for k in range(k_start, k_stop):
+        kn = k * n
+        a = int(gmpy2.isqrt(kn))
+        if a * a < kn:
+            a += 1
+        b2 = a * a - kn
+        if not _could_be_square(b2):
+            continue
+        if not gmpy2.is_square(b2):
+            continue
+        b = int(gmpy2.isqrt(b2))
+        p = int(gmpy2.gcd(a - b, n))
+        if 1 < p < n:
+            q = n // p
+            return (min(p, q), max(p, q))
+    return None
+
+
+# Parallel search tuning: chunk of multipliers per task, and the size
+# threshold below which process startup costs more than it saves.
+_FERMAT_CHUNK = 4096
+_FERMAT_PARALLEL_BITS = 128
+
+
+def fermat_factorization(n: int, max_multiplier: int = 1_000_000) -> Optional[Tuple[int, int]]:
+    """Fermat's factorization method (Hart's one-line multiplier variant).
+
+    Iterates over multipliers k, testing whether isqrt(k*n)+1 squared minus
+    k*n is a perfect square; a hit yields a factor via gcd. This finds
+    balanced factors much faster than incrementing a from ceil(sqrt(n)).
+    The multiplier dimension is embarrassingly parallel, so for large n
+    chunks of k are fanned out across one process per core (threads would
+    serialize on the GIL for big-int work); the first hit wins and
+    remaining chunks are cancelled.
+    """
     if n % 2 == 0:
         return (2, n // 2)
-    
-    a = int(math.ceil(math.sqrt(n)))
-    b2 = a * a - n
-    
-    while not gmpy2.is_square(b2):
-        a += 1
-        b2 = a * a - n
-        if a > n // 2:
-            return None
-    
-    b = int(math.sqrt(b2))
-    p, q = a - b, a + b
-    
-    if p * q == n and p > 1 and q > 1:
-        return (p, q)
+
+    if n.bit_length() < _FERMAT_PARALLEL_BITS:
+        return _fermat_range(n, 1, max_multiplier + 1)
+
+    workers = os.cpu_count() or 1
+    result = None
+    next_k = 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+
+        def submit_chunk():
+            nonlocal next_k
+            if next_k <= max_multiplier:
+                stop = min(next_k + _FERMAT_CHUNK, max_multiplier + 1)
+                pending.add(pool.submit(_fermat_range, n, next_k, stop))
+                next_k = stop
+
+        for _ in range(workers * 2):
+            submit_chunk()
+
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                result = result or future.result()
+            if result is not None:
+                for future in pending:
+                    future.cancel()
+                break
+            for _ in done:
+                submit_chunk()
+
+    return result
+
+
+def pollard_pm1(n: int, B: int = 100_000) -> Optional[int]:
+    """Pollard's p-1 factorization for B-smooth p-1.
+
+    Raises a base to the power of every prime q <= B (to the largest
+    q^e <= B), taking a gcd every 64 primes. Finds p in O(B log B) bignum
+    ops whenever p-1 has only factors below B -- a common setup in
+    CTF-style challenges where rho would be hopeless.
+    """
+    n = mpz(n)
+    if n % 2 == 0:
+        return 2
+
+    primes = _SMALL_PRIMES if B <= _SMALL_PRIME_LIMIT else _sieve(B)
+    a = mpz(2)
+    log_B = math.log(B)
+
+    for i, q in enumerate(primes):
+        if q > B:
+            break
+        exp = int(log_B // math.log(q))
+        a = powmod(a, q ** exp, n)
+        if i & 63 == 63:
+            g = gmpy2.gcd(a - 1, n)
+            if 1 < g < n:
+                return int(g)
+            if g == n:
+                return None
+
+    g = gmpy2.gcd(a - 1, n)
+    if 1 < g < n:
+        return int(g)
     return None
 
 
+def _cf_convergents(e: int, n: int):
+    """Yield (a, h, k): each partial quotient of e/n with its convergent.
+
+    Runs the rolling recurrence h_i = a_i*h_{i-1} + h_{i-2} (same for k)
+    on gmpy2.mpz, one GMP divmod and two multiply-adds per term, and
+    yields lazily so callers that break early never pay for the tail.
+    """
+    num, den = mpz(e), mpz(n)
+    h0, h1 = mpz(0), mpz(1)
+    k0, k1 = mpz(1), mpz(0)
+    while den:
+        a, r = divmod(num, den)
+        h = a * h1 + h0
+        k = a * k1 + k0
+        yield a, h, k
+        h0, h1, k0, k1 = h1, h, k1, k
+        num, den = den, r
+
+
+# Convergents whose partial quotient is anomalously large are dead ends
+# for Wiener: a huge a_i means the previous convergent was already an
+# extremely good approximation of e/n, so skip testing those candidates.
+_WIENER_QUOTIENT_LIMIT = 1 << 20
+
+
+def factor_sympy(n: int, timeout: float = 30.0) -> List[int]:
+    """Fallback factorization via sympy.factorint.
+
+    sympy chains trial division, rho, p-1 and ECM; ECM in particular pulls
+    out ~60-80 bit factors that none of the hand-rolled attacks here can
+    reach. Runs in a worker thread so a hard input gives up after the
+    timeout instead of hanging the REPL (the thread itself cannot be
+    killed and is left to finish in the background). Returns the factor
+    list with multiplicity, or [] on timeout/failure.
+    """
+    if _sympy_factorint is None:
+        print_error("sympy is not installed")
+        return []
+
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    try:
+        future = pool.submit(_sympy_factorint, n, limit=10 ** 6)
+        factor_map = future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        print_error(f"sympy factorization timed out after {timeout}s")
+        return []
+    except Exception as e:
+        print_error(f"sympy factorization failed: {e}")
+        return []
+    finally:
+        pool.shutdown(wait=False)
+
+    factors = []
+    for prime, exp in sorted(factor_map.items()):
+        factors.extend([int(prime)] * exp)
+    return factors
+
+
 def wiener_attack(n: int, e: int) -> Optional[int]:
     """Wiener's attack for small private exponents."""
-    def continued_fraction(n, d):
-        if d == 0:
-            return
-        while d:
-            a = n // d
-            yield a
-            n, d = d, n - a * d
-
-    def convergents(cf):
-        h0, h1 = 0, 1
-        k0, k1 = 1, 0
-        for a in cf:
-            h = a * h1 + h0
-            k = a * k1 + k0
-            yield h, k
-            h0, h1 = h1, h
-            k0, k1 = k1, k
-
-    for h, k in convergents(continued_fraction(e, n)):
-        if k == 0:
+    # Wiener's bound: d < n^(1/4)/3, so once the denominator outgrows
+    # ~n^(1/4) no later convergent can be the private exponent.
+    max_d_bits = n.bit_length() // 4 + 2
+
+    for a, h, k in _cf_convergents(e, n):
+        if k.bit_length() > max_d_bits:
+            break
+        if k == 0 or h == 0 or a > _WIENER_QUOTIENT_LIMIT:
             continue
-        
-        phi_n = (e * k - 1) // h
-        if phi_n <= 0:
+
+        # For the right convergent, e*k - 1 is an exact multiple of h.
+        # This single divmod rejects nearly every wrong candidate before
+        # any square-root work.
+        phi_n, remainder = divmod(e * k - 1, h)
+        if remainder or phi_n <= 0:
             continue
-            
+
         s = n - phi_n + 1
         discriminant = s * s - 4 * n
-        
+
         if discriminant < 0:
             continue
-            
-        sqrt_discriminant = int(math.sqrt(discriminant))
+        # Perfect squares are 0 or 1 mod 4.
+        if discriminant & 3 > 1:
+            continue
+
+        sqrt_discriminant = int(gmpy2.isqrt(discriminant))
         if sqrt_discriminant * sqrt_discriminant != discriminant:
             continue
             
@@ -230,8 +511,7 @@ def wiener_attack(n: int, e: int) -> Optional[int]:
         q = (s - sqrt_discriminant) // 2
         
         if p * q == n and p != 1 and q != 1:
-            d = inverse(e, phi_n)
-            return d
+            return int(invert(mpz(e), mpz(phi_n)))
     
     return None
 
@@ -239,27 +519,16 @@ def wiener_attack(n: int, e: int) -> Optional[int]:
 def common_modulus_attack(n: int, c1: int, c2: int, e1: int, e2: int) -> Optional[int]:
     """Common modulus attack when gcd(e1, e2) = 1."""
     try:
-        def extended_gcd(a, b):
-            if a == 0:
-                return b, 0, 1
-            gcd, x1, y1 = extended_gcd(b % a, a)
-            x = y1 - (b // a) * x1
-            y = x1
-            return gcd, x, y
-        
-        gcd, s, t = extended_gcd(e1, e2)
+        # gmpy2.gcdext dispatches to GMP's extended binary gcd, with no
+        # Python recursion depth to worry about.
+        gcd, s, t = gmpy2.gcdext(e1, e2)
         if gcd != 1:
             return None
-        
-        if s < 0:
-            c1 = inverse(c1, n)
-            s = -s
-        if t < 0:
-            c2 = inverse(c2, n)
-            t = -t
-        
-        m = pow(c1, s, n) * pow(c2, t, n) % n
-        return m
+
+        # powmod handles negative exponents natively (inverting once
+        # internally), so no separate modular-inverse pass is needed.
+        m = powmod(c1, s, n) * powmod(c2, t, n) % n
+        return int(m)
     except Exception as e:
         print_error(f"Common modulus attack failed: {e}")
         return None
@@ -282,73 +551,222 @@ def low_public_exponent_attack(ct: int, e: int, n: int) -> Optional[int]:
     return None
 
 
-def trial_division(n: int, limit: int = 10000) -> List[int]:
-    """Simple trial division for small factors."""
+def _sieve(limit: int) -> List[int]:
+    """Sieve of Eratosthenes: all primes up to and including limit."""
+    flags = bytearray([1]) * (limit + 1)
+    flags[0] = flags[1] = 0
+    for i in range(2, int(gmpy2.isqrt(limit)) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytearray(len(flags[i * i::i]))
+    return [i for i, is_prime in enumerate(flags) if is_prime]
+
+
+_SMALL_PRIME_LIMIT = 100_000
+_SMALL_PRIMES = _sieve(_SMALL_PRIME_LIMIT)
+
+# 2,3,5 wheel: candidates coprime to 30 and the gaps between them.
+_WHEEL_OFFSETS = (1, 7, 11, 13, 17, 19, 23, 29)
+_WHEEL_STEPS = (6, 4, 2, 4, 2, 4, 6, 2)
+
+# Residuals up to this many bits are handed to rho after trial division;
+# anything larger could stall for minutes (trial_division also runs inside
+# the FactorDB race, which must stay responsive).
+_RHO_RESIDUAL_BITS = 80
+
+
+def _rho_split(n, factors: List[int]) -> None:
+    """Recursively split a composite with Pollard's rho into factors."""
+    if n == 1:
+        return
+    if gmpy2.is_prime(n):
+        factors.append(int(n))
+        return
+    g = pollard_rho_factorization(int(n))
+    if g is None or g in (1, n):
+        factors.append(int(n))
+        return
+    _rho_split(g, factors)
+    _rho_split(n // g, factors)
+
+
+_PRIMORIAL = None
+_PRIMORIAL_GCD_BITS = 256
+
+
+def _small_prime_primorial() -> int:
+    """Product of every sieved prime, built lazily and cached.
+
+    One gcd of a large n against this ~144k-bit constant reveals the
+    combined small-factor mass in a single bignum operation, replacing
+    ~9600 individual big-int mod operations.
+    """
+    global _PRIMORIAL
+    if _PRIMORIAL is None:
+        product = mpz(1)
+        for d in _SMALL_PRIMES:
+            product *= d
+        _PRIMORIAL = product
+    return _PRIMORIAL
+
+
+def trial_division(n: int, limit: int = 10000,
+                   stop_event: Optional[threading.Event] = None) -> List[int]:
+    """Trial division by a precomputed prime table.
+
+    Divides by sieved primes instead of every integer, cutting the number
+    of big-int mod operations by ~85%. Large n additionally get a
+    primorial-gcd prefilter: a single gcd against the product of all
+    sieved primes finds which small primes divide n, so the division loop
+    only touches those. For limits beyond the sieve, falls through to a
+    2,3,5-wheel increment loop. When racing against other strategies,
+    pass a threading.Event as stop_event; the loop aborts early once it
+    is set.
+    """
     factors = []
-    d = 2
-    
-    while d * d <= n and d <= limit:
+    n = gmpy2.mpz(n)
+
+    if n.bit_length() > _PRIMORIAL_GCD_BITS:
+        # For big moduli the gcd costs less than even a fraction of the
+        # per-prime mod loop, and usually proves there is nothing to find.
+        g = gmpy2.gcd(n, _small_prime_primorial())
+        candidates = [d for d in _SMALL_PRIMES if d <= limit and g % d == 0] \
+            if g > 1 else []
+    else:
+        candidates = _SMALL_PRIMES
+
+    for i, d in enumerate(candidates):
+        if d > limit or d * d > n:
+            break
+        if stop_event is not None and i & 255 == 0 and stop_event.is_set():
+            return []
         while n % d == 0:
             factors.append(d)
             n //= d
-        d += 1
-    
+
+    if limit > _SMALL_PRIME_LIMIT:
+        # Continue past the sieve with wheel increments (skips multiples
+        # of 2, 3 and 5 -- 73% of candidates).
+        idx = 0
+        d = (_SMALL_PRIME_LIMIT // 30) * 30 + _WHEEL_OFFSETS[0]
+        while d <= _SMALL_PRIME_LIMIT:
+            d += _WHEEL_STEPS[idx]
+            idx = (idx + 1) & 7
+        while d <= limit and d * d <= n:
+            if stop_event is not None and idx == 0 and stop_event.is_set():
+                return []
+            while n % d == 0:
+                factors.append(d)
+                n //= d
+            d += _WHEEL_STEPS[idx]
+            idx = (idx + 1) & 7
+
     if n > 1:
-        factors.append(n)
-    
+        if n.bit_length() <= _RHO_RESIDUAL_BITS and not gmpy2.is_prime(n):
+            # Fused trial-division + rho pass: split a small composite
+            # residual completely instead of reporting it as one factor.
+            split = []
+            _rho_split(n, split)
+            factors.extend(sorted(split))
+        else:
+            factors.append(int(n))
+
     return factors
 
 
-def cube_root_attack(ct: int, n: int = None) -> Optional[bytes]:
-    """Attempt cube root attack for small e=3 cases."""
+def _int_to_bytes(value: int) -> bytes:
+    """Big-endian bytes of a non-negative integer via the C-level int.to_bytes."""
+    return value.to_bytes(max(1, (value.bit_length() + 7) // 8), 'big')
+
+
+def cube_root_attack(ct: int, n: int = None, max_k: int = 1000) -> Optional[bytes]:
+    """Attempt cube root attack for small e=3 cases.
+
+    Uses gmpy2.iroot, which works in exact integer arithmetic and reports
+    whether the root is exact -- no float precision to manage, unlike the
+    former cbrt-based version which broke down past ~100-digit inputs.
+    """
     try:
-        with gmpy2.local_context(gmpy2.context(), precision=300) as ctx:
-            if n is None:
-                cube_root = gmpy2.cbrt(ct)
-            else:
-                k = 0
-                while True:
-                    test_val = ct + k * n
-                    cube_root = gmpy2.cbrt(test_val)
-                    if pow(int(cube_root), 3) == test_val:
-                        break
-                    k += 1
-                    if k > 1000:
-                        print_error("Cube root attack failed after 1000 iterations")
-                        return None
-            
-            result = int(cube_root)
-            try:
-                hex_val = hex(result)[2:]
-                if len(hex_val) % 2:
-                    hex_val = '0' + hex_val
-                return binascii.unhexlify(hex_val)
-            except:
-                return str(result).encode()
+        ct = mpz(ct)
+        if n is None:
+            root, exact = gmpy2.iroot(ct, 3)
+            return _int_to_bytes(int(root)) if exact else None
+
+        n = mpz(n)
+        for k in range(max_k + 1):
+            root, exact = gmpy2.iroot(ct + k * n, 3)
+            if exact:
+                return _int_to_bytes(int(root))
+
+        print_error(f"Cube root attack failed after {max_k} iterations")
+        return None
     except Exception as e:
         print_error(f"Cube root attack failed: {e}")
         return None
-    
 
-def generate_ssh_key(n: int, e: int, d: int, p: int, q: int, output_path: str) -> bool:
-    """Generate SSH private key from RSA parameters."""
+
+def hastad_broadcast_attack(moduli: List[int], ciphertexts: List[int],
+                            e: int = 3) -> Optional[bytes]:
+    """Håstad's broadcast attack for a small exponent e.
+
+    Given the same message encrypted under e (or more) pairwise-coprime
+    moduli, CRT-combine the ciphertexts into m^e over the integers and
+    take an exact e-th root. Strictly more general than the raw cube
+    root: it works even when m^3 wraps each individual modulus.
+    """
+    if len(moduli) != len(ciphertexts) or len(moduli) < e:
+        print_error(f"Need at least {e} (n, ct) pairs with matching counts")
+        return None
+
+    try:
+        N = mpz(1)
+        for n_i in moduli:
+            N *= n_i
+
+        combined = mpz(0)
+        for n_i, ct_i in zip(moduli, ciphertexts):
+            N_i = N // n_i
+            combined += ct_i * N_i * invert(N_i, n_i)
+        combined %= N
+
+        root, exact = gmpy2.iroot(combined, e)
+        if exact:
+            return _int_to_bytes(int(root))
+        print_error("CRT combination is not an exact e-th power")
+        return None
+    except Exception as ex:
+        print_error(f"Håstad broadcast attack failed: {ex}")
+        return None
+
+def generate_ssh_key(n: int, e: int, d: int, p: int, q: int,
+                     output_path) -> Tuple[bool, Optional[str]]:
+    """Generate SSH private key from RSA parameters.
+
+    output_path may be a filesystem path or any binary file-like object
+    (e.g. io.BytesIO), so callers that only need the PEM in memory can
+    skip the disk round-trip. Returns (success, pem) so callers can use
+    the key material directly without re-reading the file.
+    """
     try:
         if not all([n, e, d, p, q]):
             print_error("All RSA parameters (n, e, d, p, q) are required")
-            return False
-        
+            return False, None
+
         key = RSA.construct((n, e, d, p, q))
         private_key_pem = key.export_key(format='PEM')
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(private_key_pem.decode())
-        
-        print_success(f"SSH private key saved to {output_path}")
-        print_info("Don't forget to set proper permissions: chmod 600 <keyfile>")
-        logger.info(f"SSH key generated and saved to {output_path}")
-        return True
+
+        if hasattr(output_path, 'write'):
+            output_path.write(private_key_pem)
+            destination = getattr(output_path, 'name', 'in-memory buffer')
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(private_key_pem.decode())
+            destination = output_path
+            print_info("Don't forget to set proper permissions: chmod 600 <keyfile>")
+
+        print_success(f"SSH private key saved to {destination}")
+        logger.info(f"SSH key generated and saved to {destination}")
+        return True, private_key_pem.decode()
     except Exception as e:
         print_error(f"SSH key generation failed: {e}")
         logger.error(f"SSH key generation error: {e}")
-        return False
-    
\ No newline at end of file
+        return False, None
\ No newline at end of file
@@ -1,18 +1,19 @@
 import os
-import time
+import sys
 import logging
-from typing import Union, Optional
+from typing import Callable, Union, Optional
 from pathlib import Path
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.panel import Panel
-import colorama
-from colorama import Fore, Style
 
-colorama.init()
+# Progress, Table and Panel are imported lazily inside the functions that
+# render them: only Console is needed on every code path, and deferring the
+# rest shaves startup for scripted runs that never draw a table.
 console = Console()
 
+# Batch mode: suppress status output entirely (mirrors a -q flag) so hot
+# loops don't pay for Rich ANSI rendering on every print.
+QUIET = bool(os.environ.get("SOLVECRYPTO_QUIET"))
+
 def setup_logging(log_file: Path, level: int = logging.INFO) -> logging.Logger:
     """Setup logging configuration."""
     logging.basicConfig(
@@ -25,22 +26,48 @@ def setup_logging(log_file: Path, level: int = logging.INFO) -> logging.Logger:
     )
     return logging.getLogger(__name__)
 
+# ANSI clear works everywhere except dumb terminals; detect once at import
+# so clear_screen never pays for the check per call.
+_ANSI_CLEAR_OK = sys.stdout.isatty() and os.environ.get("TERM") != "dumb"
+
 def clear_screen():
-    """Clear the terminal screen."""
-    os.system('clear' if os.name == 'posix' else 'cls')
+    """Clear the terminal screen.
+
+    Writes the ANSI clear+home sequence directly instead of forking an
+    external clear/cls process, which cost tens of milliseconds per
+    menu redraw.
+    """
+    if _ANSI_CLEAR_OK:
+        sys.stdout.write("\x1b[2J\x1b[3J\x1b[H")
+        sys.stdout.flush()
+    else:
+        os.system('clear' if os.name == 'posix' else 'cls')
+
+def animated_loading(text: str = "Loading", work: Optional[Callable] = None):
+    """Run `work` under a spinner and return its result.
+
+    The spinner lasts exactly as long as the work does -- no artificial
+    sleep. With no work the call returns immediately; when output is
+    piped or SOLVECRYPTO_NO_ANIM is set, work runs without the spinner.
+    """
+    if work is None:
+        return None
+    if not sys.stdout.isatty() or os.environ.get("SOLVECRYPTO_NO_ANIM"):
+        return work()
+    from rich.progress import Progress, SpinnerColumn, TextColumn
 
-def animated_loading(text: str = "Loading", duration: float = 2.0):
-    """Display animated loading with progress bar."""
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True,
     ) as progress:
-        task = progress.add_task(description=text, total=None)
-        time.sleep(duration)
+        progress.add_task(description=text, total=None)
+        return work()
 
 def display_banner():
     """Display application banner."""
+    from rich.panel import Panel
+
     banner = """
 ╔═══════════════════════════════════════════╗
 ║          SolveCrypto v2.0                 ║
@@ -52,84 +79,162 @@ def display_banner():
     console.print(Panel(banner, style="bold blue"))
 
 def validate_integer_input(value: str, param_name: str) -> Optional[int]:
-    """Validate integer input with proper error handling."""
-    try:
-        if not value or value == '0':
-            return 0
+    """Validate integer input with proper error handling.
+
+    Accepts decimal, prefixed hex/octal/binary (0x/0o/0b) and scientific
+    notation, since challenge values are routinely pasted in hex.
+    """
+    value = value.strip()
+    if not value or value == '0':
+        return 0
+    # Plain decimal digits are by far the common case; int() on them is
+    # cheaper than int(value, 0)'s base sniffing and needs no try/except.
+    digits = value[1:] if value[0] in '+-' else value
+    if digits.isascii() and digits.isdigit():
         return int(value)
+    try:
+        return int(value, 0)
     except ValueError:
-        console.print(f"[red]Error: {param_name} must be a valid integer[/red]")
+        pass
+    # Scientific notation is parsed with Decimal, which is exact for any
+    # magnitude; going through float would silently round values past 2^53.
+    from decimal import Decimal, InvalidOperation
+
+    try:
+        as_decimal = Decimal(value)
+        if as_decimal.is_finite() and as_decimal == as_decimal.to_integral_value():
+            return int(as_decimal)
+    except InvalidOperation:
+        pass
+    console.print(f"[red]Error: {param_name} must be a valid integer[/red]")
+    return None
+
+def load_rsa_key_params(path: Union[str, Path]) -> Optional[dict]:
+    """Extract RSA parameters from a PEM/DER key file.
+
+    Returns n and e, plus d, p and q when the key is private.
+    """
+    from Crypto.PublicKey import RSA
+
+    try:
+        with open(path, 'rb') as f:
+            key = RSA.import_key(f.read())
+    except (OSError, ValueError, IndexError, TypeError) as e:
+        print_error(f"Could not load key from {path}: {e}")
         return None
 
-def format_rsa_options(n: int = 0, ct: int = 0, e: int = 0, p: int = 0, 
-                      q: int = 0, phi: int = 0, d: int = 0) -> str:
+    params = {'n': key.n, 'e': key.e}
+    if key.has_private():
+        params.update({'d': key.d, 'p': key.p, 'q': key.q})
+    return params
+
+def format_rsa_options(n: int = 0, ct: int = 0, e: int = 0, p: int = 0,
+                      q: int = 0, phi: int = 0, d: int = 0,
+                      dp: int = 0, dq: int = 0, qinv: int = 0) -> str:
     """Format RSA options display."""
+    rows = [
+        ("n (modulus)", n),
+        ("ct (ciphertext)", ct),
+        ("e (exponent)", e),
+        ("p (prime 1)", p),
+        ("q (prime 2)", q),
+        ("φ(n) (phi)", phi),
+        ("d (private exp)", d),
+    ]
+    # Derived CRT parameters only appear once they have been computed
+    if dp or dq or qinv:
+        rows += [
+            ("dp (d mod p-1)", dp),
+            ("dq (d mod q-1)", dq),
+            ("qinv (q^-1 mod p)", qinv),
+        ]
+
+    if not console.is_terminal:
+        # Piped/scripted output: a plain listing skips Rich's column
+        # measurement and layout engine entirely.
+        return "\n".join(
+            f"{label}: {value if value else 'Not set'}" for label, value in rows
+        )
+
+    from rich.table import Table
+
     table = Table(title="Current RSA Parameters", show_header=True)
-    table.add_column("Parameter", style="cyan")
-    table.add_column("Value", style="yellow")
-    
-    table.add_row("n (modulus)", str(n) if n else "Not set")
-    table.add_row("ct (ciphertext)", str(ct) if ct else "Not set")
-    table.add_row("e (exponent)", str(e) if e else "Not set")
-    table.add_row("p (prime 1)", str(p) if p else "Not set")
-    table.add_row("q (prime 2)", str(q) if q else "Not set")
-    table.add_row("φ(n) (phi)", str(phi) if phi else "Not set")
-    table.add_row("d (private exp)", str(d) if d else "Not set")
-    
+    for name, style in _OPTIONS_COLUMNS:
+        table.add_column(name, style=style)
+    for label, value in rows:
+        table.add_row(label, str(value) if value else "Not set")
+
     return table
 
+# Static table scaffolding, hoisted so the REPL doesn't rebuild identical
+# column definitions and description dicts on every help/options call.
+_OPTIONS_COLUMNS = (("Parameter", "cyan"), ("Value", "yellow"))
+_HELP_COLUMNS = (("Command", "cyan"), ("Aliases", "yellow"), ("Description", "green"))
+_COMMAND_DESCRIPTIONS = {
+    'set': 'Set RSA parameters (set n 12345, set n 0xdead, set pem key.pem)',
+    'options': 'Display current RSA parameters',
+    'start': 'Enter solving mode',
+    'factor': 'Factor the modulus n',
+    'square': 'Try square root attack',
+    'modulare': 'Modular arithmetic operations',
+    'pwn': 'Decrypt the ciphertext',
+    'ssh': 'Generate SSH private key',
+    'wiener': 'Wiener attack for small d',
+    'common_modulus': 'Common modulus attack',
+    'pollard_rho': 'Pollard rho factorization',
+    'pm1': 'Pollard p-1 factorization (smooth p-1)',
+    'fermat': 'Fermat factorization',
+    'help': 'Show this help message',
+    'exit': 'Exit the program'
+}
+
 def display_help(commands: dict, title: str = "Available Commands"):
     """Display help information."""
+    from rich.table import Table
+
     table = Table(title=title, show_header=True)
-    table.add_column("Command", style="cyan")
-    table.add_column("Aliases", style="yellow")
-    table.add_column("Description", style="green")
-    
-    descriptions = {
-        'set': 'Set RSA parameters (e.g., set n 12345)',
-        'options': 'Display current RSA parameters',
-        'start': 'Enter solving mode',
-        'factor': 'Factor the modulus n',
-        'square': 'Try square root attack',
-        'modulare': 'Modular arithmetic operations',
-        'pwn': 'Decrypt the ciphertext',
-        'ssh': 'Generate SSH private key',
-        'wiener': 'Wiener attack for small d',
-        'common_modulus': 'Common modulus attack',
-        'pollard_rho': 'Pollard rho factorization',
-        'fermat': 'Fermat factorization',
-        'help': 'Show this help message',
-        'exit': 'Exit the program'
-    }
-    
+    for name, style in _HELP_COLUMNS:
+        table.add_column(name, style=style)
+
     for cmd, aliases in commands.items():
-        desc = descriptions.get(cmd, "No description available")
+        desc = _COMMAND_DESCRIPTIONS.get(cmd, "No description available")
         table.add_row(cmd, ", ".join(aliases), desc)
-    
+
     console.print(table)
 
 def print_success(message: str):
     """Print success message."""
+    if QUIET:
+        return
     console.print(f"[green]✓ {message}[/green]")
 
 def print_error(message: str):
     """Print error message."""
+    if QUIET:
+        return
     console.print(f"[red]✗ {message}[/red]")
 
 def print_info(message: str):
     """Print info message."""
+    if QUIET:
+        return
     console.print(f"[blue]ℹ {message}[/blue]")
 
 def print_warning(message: str):
     """Print warning message."""
+    if QUIET:
+        return
     console.print(f"[yellow]⚠ {message}[/yellow]")
 
 def save_result(content: str, filename: str, output_dir: Path):
     """Save result to file with error handling."""
     try:
         output_path = output_dir / filename
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Encode once and write bytes in a single call; sizing the buffer
+        # to the payload avoids TextIOWrapper chunking large results.
+        data = content.encode('utf-8')
+        with open(output_path, 'wb', buffering=max(8192, len(data))) as f:
+            f.write(data)
         print_success(f"Result saved to {output_path}")
         return True
     except Exception as e: